@@ -1,40 +1,34 @@
 import sys
 import time
-import random
 from pathlib import Path
 
+import numpy as np
+
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src import Order, OrderBook
+from src import OrderBook
 
-def generate_random_orders(n: int, base_price: float = 100.0) -> list:
-    """Generate random orders around a base price"""
-    orders = []
-    order_id = 1
+def generate_random_orders(n: int, base_price: float = 100.0, seed: int = 42) -> tuple:
+    """Generate random orders around a base price as (ids, prices, quantities, sides) arrays"""
+    rng = np.random.default_rng(seed)
     
-    for _ in range(n):
-        is_buy = random.random() > 0.5
-        
-        # Price within +/- 5% of base
-        price_offset = random.uniform(-5, 5)
-        price = round(base_price * (1 + price_offset/100), 2)
-        
-        # Quantity between 1 and 100
-        quantity = random.randint(1, 100)
-        
-        order = Order(order_id, price, quantity, is_buy, time.time())
-        orders.append(order)
-        order_id += 1
+    ids = np.arange(1, n + 1)
+    sides = rng.random(n) > 0.5
+    
+    # Price within +/- 5% of base
+    prices = np.round(base_price * (1 + rng.uniform(-5, 5, n) / 100), 2)
+    
+    # Quantity between 1 and 100
+    quantities = rng.integers(1, 101, n)
     
-    return orders
+    return ids, prices, quantities, sides
 
-def benchmark_add_orders(orders: list) -> tuple:
+def benchmark_add_orders(orders: tuple) -> tuple:
     """Benchmark adding orders, return (time, book)"""
     book = OrderBook()
     
     start = time.perf_counter()
-    for order in orders:
-        book.add_order(order)
+    book.add_orders(*orders, collect_trades=False)
     end = time.perf_counter()
     
     return end - start, book
@@ -79,7 +73,9 @@ def main():
         remaining_ids = list(book.order_map.keys())
         if remaining_ids:
             num_to_cancel = min(len(remaining_ids), n // 10)
-            cancel_ids = random.sample(remaining_ids, num_to_cancel)
+            cancel_ids = np.random.default_rng(42).choice(
+                remaining_ids, num_to_cancel, replace=False
+            ).tolist()
             cancel_time = benchmark_cancel_orders(book, cancel_ids)
             
             cancels_per_sec = num_to_cancel / cancel_time if cancel_time > 0 else 0
@@ -111,5 +107,4 @@ def main():
 
 
 if __name__ == "__main__":
-    random.seed(42)  # For reproducibility
     main()
\ No newline at end of file
@@ -21,11 +21,11 @@ def main():
     print("-" * 70)
 
     orders = [
-        Order(order_id, 99.0, 10, True, time.time()),   # Buy 10 @ $99
-        Order(order_id+1, 100.0, 15, True, time.time()), # Buy 15 @ $100
-        Order(order_id+2, 101.0, 20, True, time.time()), # Buy 20 @ $101
-        Order(order_id+3, 103.0, 25, False, time.time()),# Sell 25 @ $103
-        Order(order_id+4, 104.0, 30, False, time.time()),# Sell 30 @ $104
+        Order(order_id, 10, True, time.time(), 99.0),   # Buy 10 @ $99
+        Order(order_id+1, 15, True, time.time(), 100.0), # Buy 15 @ $100
+        Order(order_id+2, 20, True, time.time(), 101.0), # Buy 20 @ $101
+        Order(order_id+3, 25, False, time.time(), 103.0),# Sell 25 @ $103
+        Order(order_id+4, 30, False, time.time(), 104.0),# Sell 30 @ $104
     ]
 
     order_id += 5
@@ -40,7 +40,7 @@ def main():
     print("\n SCENARIO 2: Aggressive buy order crosses the spread")
     print("-" * 70)
     
-    aggressive_buy = Order(order_id, 103.5, 30, True, time.time())
+    aggressive_buy = Order(order_id, 30, True, time.time(), 103.5)
     order_id += 1
     print(f"  Incoming: {aggressive_buy}")
     
@@ -56,7 +56,7 @@ def main():
     print("\n SCENARIO 3: Large sell order hits multiple bid levels")
     print("-" * 70)
     
-    aggressive_sell = Order(order_id, 98.0, 50, False, time.time())
+    aggressive_sell = Order(order_id, 50, False, time.time(), 98.0)
     order_id += 1
     print(f"  Incoming: {aggressive_sell}")
     
@@ -77,10 +77,10 @@ def main():
     print("-" * 70)
     
     # Add some liquidity
-    book.add_order(Order(order_id, 102.0, 5, False, time.time()))
+    book.add_order(Order(order_id, 5, False, time.time(), 102.0))
     order_id += 1
     
-    partial_buy = Order(order_id, 102.0, 10, True, time.time())
+    partial_buy = Order(order_id, 10, True, time.time(), 102.0)
     order_id += 1
     print(f"  Incoming: {partial_buy} (but only 5 available)")
     
@@ -1,5 +1,4 @@
 from .order import Order
-from dataclasses import dataclass
 
 class OrderNotFound(Exception):
     pass
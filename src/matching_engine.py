@@ -1,7 +1,9 @@
-from typing import List
+from typing import List, Optional, Tuple
 import time
 import sys
 
+from sortedcontainers import SortedDict
+
 from .order import Order
 from .trade import Trade
 
@@ -10,57 +12,75 @@ class MatchingEngine:
     def match_order(
         self,
         new_order: Order,
-        opposite_side: dict,
-        order_map: dict
-    ) -> List[Trade]:
-        trades = []
+        limit: Optional[int],
+        opposite_side: SortedDict,
+        order_map: dict,
+        level_qty: dict,
+        level_pool: list,
+        recycle: bool = False,
+        collect_trades: bool = True
+    ) -> Tuple[Optional[List[Trade]], int, int]:
+        """Match new_order against the opposite side of the book.
+
+        Levels are keyed by integer price ticks; limit is the order's limit
+        tick, or None for a market order.
+
+        Returns (trades, num_trades, volume); trades is None when
+        collect_trades is False, in which case no Trade objects are built.
+        """
+        trades = [] if collect_trades else None
+        num_trades = 0
         remaining_qty = new_order.quantity
+        is_buy = new_order.is_buy
+        # All fills of one incoming order happen at the same match event
+        now = time.time()
         
-        if new_order.is_buy:
-            price_levels = sorted(opposite_side.keys())
-        else:
-            price_levels = sorted(opposite_side.keys(), reverse=True)
+        # Always work on the current best level; consumed levels are deleted
+        # as we go, so no snapshot of the tick keys is needed
+        ticks = opposite_side.keys()
         
-        for price in price_levels:
-            if not new_order.is_market_order:
-                if new_order.is_buy and price > new_order.price:
-                    break
-                if not new_order.is_buy and price < new_order.price:
-                    break
-
-            order_queue = opposite_side[price]
+        while remaining_qty > 0 and opposite_side:
+            tick = ticks[0] if is_buy else ticks[-1]
+            if limit is not None and (tick > limit if is_buy else tick < limit):
+                break
+            
+            order_queue = opposite_side[tick]
             
             while order_queue and remaining_qty > 0:
                 resting_order = order_queue[0]
-                
-                if resting_order.id not in order_map:
+                if resting_order.cancelled:
                     order_queue.popleft()
                     continue
                 
                 trade_qty = min(remaining_qty, resting_order.quantity)
                 
-                trade = Trade(
-                    buy_order_id=new_order.id if new_order.is_buy else resting_order.id,
-                    sell_order_id=resting_order.id if new_order.is_buy else new_order.id,
-                    price=resting_order.price, 
-                    quantity=trade_qty,
-                    timestamp=time.time()
-                )
-                trades.append(trade)
+                if collect_trades:
+                    price = resting_order.price
+                    if is_buy:
+                        trade = Trade(new_order.id, resting_order.id, price, trade_qty, now)
+                    else:
+                        trade = Trade(resting_order.id, new_order.id, price, trade_qty, now)
+                    trades.append(trade)
+                num_trades += 1
                 
                 remaining_qty -= trade_qty
                 resting_order.quantity -= trade_qty
+                level_qty[tick] -= trade_qty
                 
                 if resting_order.quantity == 0:
                     order_queue.popleft()
                     del order_map[resting_order.id]
+                    if recycle:
+                        resting_order.release()
             
-            if not order_queue:
-                del opposite_side[price]
-            
-            if remaining_qty == 0:
-                break
+            if not order_queue or not level_qty[tick]:
+                # No live orders left; hand the deque back to the book for
+                # reuse, dropping any trailing tombstones
+                order_queue.clear()
+                level_pool.append(opposite_side.pop(tick))
+                del level_qty[tick]
         
+        volume = new_order.quantity - remaining_qty
         new_order.quantity = remaining_qty
         
-        return trades
\ No newline at end of file
+        return trades, num_trades, volume
\ No newline at end of file
@@ -2,11 +2,15 @@
 Order representation for the order book.
 """
 
-from dataclasses import dataclass
-from typing import Literal, Optional
+from dataclasses import dataclass, field
+from typing import ClassVar, List, Literal, Optional
 
 
-@dataclass
+# Upper bound on released orders kept for reuse (the pool is process-wide)
+MAX_ORDER_POOL = 65536
+
+
+@dataclass(slots=True)
 class Order:
     """
     Represents an order in the book.
@@ -18,6 +22,8 @@ class Order:
         timestamp: Unix timestamp when order was created
         price: Limit price (None for market orders)
         order_type: 'limit' or 'market'
+        cancelled: Set when cancelled while queued behind other orders;
+            the matcher drops it once it reaches the head of its level
     """
     id: int
     quantity: int
@@ -25,6 +31,12 @@ class Order:
     timestamp: float
     price: Optional[float] = None
     order_type: Literal["limit", "market"] = "limit"
+    cancelled: bool = field(default=False, init=False, compare=False)
+    # order_type resolved once, so hot paths test a bool instead of a string
+    _is_market: bool = field(init=False, repr=False, compare=False)
+
+    # Free-list of released orders, reused by acquire()
+    _pool: ClassVar[List["Order"]] = []
     
     def __post_init__(self):
         """Validate order after initialization"""
@@ -32,6 +44,35 @@ class Order:
             raise ValueError("Limit orders must have a price")
         if self.order_type == "market" and self.price is not None:
             raise ValueError("Market orders should not have a price")
+        self._is_market = self.order_type == "market"
+    
+    @classmethod
+    def acquire(
+        cls,
+        id: int,
+        quantity: int,
+        is_buy: bool,
+        timestamp: float,
+        price: Optional[float] = None,
+        order_type: Literal["limit", "market"] = "limit",
+    ) -> "Order":
+        """Get an order from the pool, allocating only if it is empty"""
+        if cls._pool:
+            order = cls._pool.pop()
+            order.__init__(id, quantity, is_buy, timestamp, price, order_type)
+            return order
+        return cls(id, quantity, is_buy, timestamp, price, order_type)
+
+    def release(self):
+        """Return this order to the pool; it must not be used afterwards"""
+        if len(Order._pool) < MAX_ORDER_POOL:
+            Order._pool.append(self)
+
+    @classmethod
+    def reserve(cls, n: int):
+        """Pre-grow the pool to at least n orders, up to MAX_ORDER_POOL"""
+        for _ in range(min(n, MAX_ORDER_POOL) - len(cls._pool)):
+            cls._pool.append(cls(0, 0, True, 0.0, 0.0))
     
     @property
     def side(self) -> Literal["BUY", "SELL"]:
@@ -41,7 +82,7 @@ class Order:
     @property
     def is_market_order(self) -> bool:
         """Check if this is a market order"""
-        return self.order_type == "market"
+        return self._is_market
     
     def __repr__(self) -> str:
         if self.is_market_order:
@@ -2,14 +2,26 @@
 High-Performance Order Book Implementation
 """
 
-from collections import defaultdict, deque
-from typing import Dict, Deque, List, Optional, Tuple
+from collections import deque
+from itertools import islice
+from typing import Dict, Deque, List, Optional, Sequence, Tuple
+import time
+
+from sortedcontainers import SortedDict
 
 from .order import Order
 from .trade import Trade
+from .cancel_modify import OrderNotFound
 from .matching_engine import MatchingEngine
 
 
+# Upper bound on empty level deques kept for reuse
+MAX_LEVEL_POOL = 1024
+
+# Default price increment; levels are keyed by integer multiples of it
+TICK_SIZE = 0.01
+
+
 class OrderBook:
     """
     Limit order book with price-time priority.
@@ -18,13 +30,42 @@ class OrderBook:
     Supports adding orders, cancelling orders, and automatic order matching.
     """
 
-    def __init__(self):
-        """Initialize an empty order book"""
-        self.bids: Dict[float, Deque[Order]] = defaultdict(deque)
-        self.asks: Dict[float, Deque[Order]] = defaultdict(deque)
+    def __init__(self, pool_size: int = 0, tick_size: float = TICK_SIZE):
+        """Initialize an empty order book.
+
+        Prices are quantized to integer ticks of tick_size on entry, so
+        levels are keyed by ints rather than floats.
+
+        With pool_size > 0 the Order pool is pre-grown to that size and
+        fully filled resting orders are released back to it, so callers
+        should create orders with Order.acquire and not keep references
+        to them once they rest. The pool is shared by every book in the
+        process and capped at MAX_ORDER_POOL orders.
+        """
+        self.tick_size = tick_size
+
+        # Price levels by tick, kept sorted so best price / depth never re-sort keys
+        self.bids: SortedDict[int, Deque[Order]] = SortedDict()
+        self.asks: SortedDict[int, Deque[Order]] = SortedDict()
+
+        # Cached top of book (in ticks), refreshed only when a level is
+        # created or removed
+        self._best_bid: Optional[int] = None
+        self._best_ask: Optional[int] = None
+
+        # Emptied level deques, reused instead of allocating new ones
+        self._level_pool: List[Deque[Order]] = []
+
+        # Resting quantity per price level, so depth never walks the queues
+        self.bid_qty: Dict[int, int] = {}
+        self.ask_qty: Dict[int, int] = {}
 
-        # Order ID -> (price, is_buy) for O(1) lookup during cancellation
-        self.order_map: Dict[int, Tuple[float, bool]] = {}
+        # Order ID -> (tick, is_buy, order) for O(1) lookup during cancellation
+        self.order_map: Dict[int, Tuple[int, bool, Order]] = {}
+
+        self.recycle_orders = pool_size > 0
+        if self.recycle_orders:
+            Order.reserve(pool_size)
 
         self.matcher = MatchingEngine()
         # Statistics
@@ -32,101 +73,272 @@ class OrderBook:
         self.total_trades = 0
         self.total_volume = 0
 
-    def add_order(self, order: Order) -> List[Trade]:
+    def add_order(self, order: Order, collect_trades: bool = True) -> List[Trade]:
         """Add an order to the book and attempt to match.
 
-        Returns a list of generated trades (empty if none).
+        Returns a list of generated trades (empty if none). With
+        collect_trades=False no Trade objects are built and the list is
+        always empty; only the book statistics are updated.
+
+        Raises ValueError for a limit price that is not a whole number of
+        ticks (see tick_size), and for an Order that has been cancelled: it
+        may still sit in its old level as a tombstone, so submit a new Order
+        instead.
         """
+        if order.cancelled:
+            raise ValueError(f"Order {order.id} was cancelled; submit a new Order")
+
         # Determine side and opposite side
-        side = self.bids if order.is_buy else self.asks
-        opposite = self.asks if order.is_buy else self.bids
+        if order.is_buy:
+            side, side_qty = self.bids, self.bid_qty
+            opposite, opposite_qty = self.asks, self.ask_qty
+        else:
+            side, side_qty = self.asks, self.ask_qty
+            opposite, opposite_qty = self.bids, self.bid_qty
 
-        # Try to match using the matching engine
-        trades = self.matcher.match_order(order, opposite, self.order_map)
+        tick = None
+        if not order.is_market_order:
+            tick = self.price_to_tick(order.price)
+            # Keep the order's price identical to its level so limits, trade
+            # prices and depth all agree
+            order.price = self.tick_to_price(tick)
 
-        # Update stats from trades
-        for t in trades:
-            self.total_trades += 1
-            self.total_volume += t.quantity
+        # Try to match using the matching engine
+        opposite_levels = len(opposite)
+        trades, num_trades, volume = self.matcher.match_order(
+            order, tick, opposite, self.order_map, opposite_qty,
+            self._level_pool, self.recycle_orders, collect_trades
+        )
+        if len(opposite) != opposite_levels:
+            self._refresh_best(not order.is_buy)
+            if len(self._level_pool) > MAX_LEVEL_POOL:
+                del self._level_pool[MAX_LEVEL_POOL:]
+
+        self.total_trades += num_trades
+        self.total_volume += volume
 
         # If it's a limit order and still has remaining quantity, add to book
-        if not order.is_market_order and order.quantity > 0:
-            price = order.price
-            side[price].append(order)
-            self.order_map[order.id] = (price, order.is_buy)
+        if tick is not None and order.quantity > 0:
+            level = side.get(tick)
+            if level is None:
+                level = side[tick] = self._new_level()
+                if order.is_buy:
+                    if self._best_bid is None or tick > self._best_bid:
+                        self._best_bid = tick
+                elif self._best_ask is None or tick < self._best_ask:
+                    self._best_ask = tick
+            level.append(order)
+            side_qty[tick] = side_qty.get(tick, 0) + order.quantity
+            self.order_map[order.id] = (tick, order.is_buy, order)
             self.total_orders += 1
 
-        return trades
+        return trades if trades is not None else []
+
+    def add_orders(
+        self,
+        ids: Sequence[int],
+        prices: Sequence[float],
+        quantities: Sequence[int],
+        is_buy_flags: Sequence[bool],
+        collect_trades: bool = True,
+    ) -> Optional[Tuple[List[float], List[int], List[int], List[int]]]:
+        """Add a batch of limit orders given as parallel arrays.
+
+        Accepts NumPy arrays or plain sequences. Returns the generated
+        trades as parallel lists: (prices, quantities, buy_ids, sell_ids),
+        or None with collect_trades=False.
+        """
+        # NumPy arrays are converted once so the loop sees Python scalars
+        columns = [
+            c.tolist() if hasattr(c, "tolist") else c
+            for c in (ids, prices, quantities, is_buy_flags)
+        ]
+        # Check up front so a ragged batch is rejected before any order is added
+        if len({len(c) for c in columns}) > 1:
+            raise ValueError(
+                "ids, prices, quantities and is_buy_flags must have the same length"
+            )
+
+        add_order = self.add_order
+        acquire = Order.acquire
+        now = time.time()
+
+        if not collect_trades:
+            for order_id, price, qty, is_buy in zip(*columns):
+                add_order(acquire(order_id, qty, is_buy, now, price), False)
+            return None
+
+        trade_prices: List[float] = []
+        trade_qtys: List[int] = []
+        buy_ids: List[int] = []
+        sell_ids: List[int] = []
+        add_price = trade_prices.append
+        add_qty = trade_qtys.append
+        add_buy = buy_ids.append
+        add_sell = sell_ids.append
+
+        for order_id, price, qty, is_buy in zip(*columns):
+            for t in add_order(acquire(order_id, qty, is_buy, now, price)):
+                add_price(t.price)
+                add_qty(t.quantity)
+                add_buy(t.buy_order_id)
+                add_sell(t.sell_order_id)
+
+        return trade_prices, trade_qtys, buy_ids, sell_ids
 
     def cancel_order(self, order_id: int) -> bool:
-        if order_id not in self.order_map:
+        entry = self.order_map.pop(order_id, None)
+        if entry is None:
             return False
 
-        price, is_buy = self.order_map[order_id]
+        tick, is_buy, order = entry
         side = self.bids if is_buy else self.asks
+        side_qty = self.bid_qty if is_buy else self.ask_qty
+
+        level = side[tick]
+        remaining_qty = side_qty[tick] - order.quantity
+        if remaining_qty:
+            side_qty[tick] = remaining_qty
+            # Pop from the head, otherwise tombstone the order instead of
+            # scanning the level; the matcher drops it when it reaches the head
+            if level[0] is order:
+                level.popleft()
+            else:
+                order.cancelled = True
+        else:
+            # Last live order at this price: drop the level with any tombstones
+            level.clear()
+            self._free_level(side.pop(tick))
+            del side_qty[tick]
+            self._refresh_best(is_buy)
+        return True
 
-        # Lazy deletion: remove from queue head if it matches
-        if price in side and side[price]:
-            head = side[price][0]
-            if head.id == order_id:
-                side[price].popleft()
-                if not side[price]:
-                    del side[price]
-                del self.order_map[order_id]
-                return True
-
-        # Otherwise remove mapping (resting order will be skipped later)
+    def modify_order(
+        self,
+        order_id: int,
+        new_price: Optional[float] = None,
+        new_quantity: Optional[int] = None,
+    ) -> List[Trade]:
+        """Change a resting order's price and/or quantity.
+
+        Reducing the quantity at the same price keeps the order's time
+        priority. A price change or a quantity increase moves it to the back
+        of its (new) level and may match immediately; the trades are
+        returned. Raises OrderNotFound if the order is not resting.
+        """
+        entry = self.order_map.get(order_id)
+        if entry is None:
+            raise OrderNotFound(f"Order {order_id} not found")
+        if new_quantity is not None and new_quantity <= 0:
+            raise ValueError("New quantity must be positive; use cancel_order")
+
+        tick, is_buy, order = entry
+        new_tick = tick if new_price is None else self.price_to_tick(new_price)
+        side_qty = self.bid_qty if is_buy else self.ask_qty
+
+        if new_tick == tick and (new_quantity is None or new_quantity <= order.quantity):
+            if new_quantity is not None:
+                side_qty[tick] += new_quantity - order.quantity
+                order.quantity = new_quantity
+            return []
+
+        # Unlink the order itself (not a tombstone) so it can be re-added
         del self.order_map[order_id]
-        return True
+        side = self.bids if is_buy else self.asks
+        level = side[tick]
+        for i, queued in enumerate(level):
+            if queued is order:
+                del level[i]
+                break
+        side_qty[tick] -= order.quantity
+        if not side_qty[tick]:
+            level.clear()
+            self._free_level(side.pop(tick))
+            del side_qty[tick]
+            self._refresh_best(is_buy)
+
+        if new_price is not None:
+            order.price = new_price
+        if new_quantity is not None:
+            order.quantity = new_quantity
+        # Re-entry of an existing order, not a new one for the statistics
+        total_orders = self.total_orders
+        trades = self.add_order(order)
+        self.total_orders = total_orders
+        return trades
+
+    def price_to_tick(self, price: float) -> int:
+        """Convert a price to ticks, rejecting prices between ticks"""
+        ticks = price / self.tick_size
+        tick = round(ticks)
+        # Compare in tick units so float error doesn't grow with the price
+        if abs(ticks - tick) > 1e-6:
+            raise ValueError(
+                f"Price {price} is not a multiple of tick size {self.tick_size}"
+            )
+        return tick
+
+    def tick_to_price(self, tick: int) -> float:
+        """Convert ticks back to a price, dropping float noise from the multiply"""
+        return round(tick * self.tick_size, 10)
+
+    def _new_level(self) -> Deque[Order]:
+        """Get an empty level deque, reusing a freed one if available"""
+        if self._level_pool:
+            return self._level_pool.pop()
+        return deque()
+
+    def _free_level(self, level: Deque[Order]):
+        """Keep an emptied level deque for reuse"""
+        if len(self._level_pool) < MAX_LEVEL_POOL:
+            self._level_pool.append(level)
+
+    def _refresh_best(self, is_buy: bool):
+        """Re-read the cached best price of one side after a level change"""
+        if is_buy:
+            self._best_bid = self.bids.keys()[-1] if self.bids else None
+        else:
+            self._best_ask = self.asks.keys()[0] if self.asks else None
 
     def get_best_bid(self) -> Optional[float]:
-        if not self.bids:
+        if self._best_bid is None:
             return None
-        return max(self.bids.keys())
+        return self.tick_to_price(self._best_bid)
 
     def get_best_ask(self) -> Optional[float]:
-        if not self.asks:
+        if self._best_ask is None:
             return None
-        return min(self.asks.keys())
+        return self.tick_to_price(self._best_ask)
 
     def get_spread(self) -> Optional[float]:
-        best_bid = self.get_best_bid()
-        best_ask = self.get_best_ask()
+        best_bid = self._best_bid
+        best_ask = self._best_ask
         if best_bid is None or best_ask is None:
             return None
-        return best_ask - best_bid
+        return self.tick_to_price(best_ask - best_bid)
 
     def get_mid_price(self) -> Optional[float]:
-        best_bid = self.get_best_bid()
-        best_ask = self.get_best_ask()
+        best_bid = self._best_bid
+        best_ask = self._best_ask
         if best_bid is None or best_ask is None:
             return None
-        return (best_bid + best_ask) / 2.0
+        # The mid can fall on a half tick, so convert without tick_to_price
+        return round((best_bid + best_ask) * self.tick_size / 2.0, 10)
 
     def get_depth(self, levels: int = 5) -> Dict:
         result = {"bids": [], "asks": []}
 
         # Get best bids (highest prices first)
-        bid_prices = sorted(self.bids.keys(), reverse=True)[:levels]
-        for price in bid_prices:
-            total_qty = sum(
-                order.quantity
-                for order in self.bids[price]
-                if order.id in self.order_map
-            )
+        for tick in islice(reversed(self.bids.keys()), levels):
+            total_qty = self.bid_qty[tick]
             if total_qty > 0:
-                result["bids"].append((price, total_qty))
+                result["bids"].append((self.tick_to_price(tick), total_qty))
 
         # Get best asks (lowest prices first)
-        ask_prices = sorted(self.asks.keys())[:levels]
-        for price in ask_prices:
-            total_qty = sum(
-                order.quantity
-                for order in self.asks[price]
-                if order.id in self.order_map
-            )
+        for tick in islice(self.asks.keys(), levels):
+            total_qty = self.ask_qty[tick]
             if total_qty > 0:
-                result["asks"].append((price, total_qty))
+                result["asks"].append((self.tick_to_price(tick), total_qty))
 
         return result
 
@@ -1,15 +1,15 @@
-def print_book(bids, asks, depth=5):
+def print_book(book, depth=5):
     print("\nORDER BOOK (top levels)")
     print("BIDS                ASKS")
     print("------------------------------")
 
-    bid_prices = sorted(bids.keys(), reverse=True)[:depth]
-    ask_prices = sorted(asks.keys())[:depth]
+    # get_depth walks only the top levels and reads the per-level totals
+    levels = book.get_depth(depth)
+    bids, asks = levels["bids"], levels["asks"]
 
-    for bp, ap in zip(bid_prices + [None]*len(ask_prices),
-                      ask_prices + [None]*len(bid_prices)):
-        bid_str = f"{bp}: {sum(o.quantity for o in bids[bp])}" if bp else ""
-        ask_str = f"{ap}: {sum(o.quantity for o in asks[ap])}" if ap else ""
+    for i in range(max(len(bids), len(asks))):
+        bid_str = f"{bids[i][0]}: {bids[i][1]}" if i < len(bids) else ""
+        ask_str = f"{asks[i][0]}: {asks[i][1]}" if i < len(asks) else ""
 
         print(f"{bid_str:<20}{ask_str}")
     print()
@@ -0,0 +1,102 @@
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src import Order, OrderBook
+from src.cancel_modify import OrderNotFound
+
+
+def limit(order_id: int, quantity: int, is_buy: bool, price: float) -> Order:
+    return Order(order_id, quantity, is_buy, time.time(), price)
+
+
+def test_cancel_behind_head_skips_tombstone_when_matching():
+    book = OrderBook()
+    book.add_order(limit(1, 10, True, 100.0))
+    book.add_order(limit(2, 5, True, 100.0))
+    book.add_order(limit(3, 7, True, 100.0))
+
+    assert book.cancel_order(2)
+    assert book.get_depth()["bids"] == [(100.0, 17)]
+
+    trades = book.add_order(limit(4, 17, False, 100.0))
+    assert [(t.buy_order_id, t.quantity) for t in trades] == [(1, 10), (3, 7)]
+    assert book.get_best_bid() is None
+    assert not book.bids and not book.bid_qty
+
+
+@pytest.mark.parametrize("price", [100.0, 101.0])
+def test_resubmitting_cancelled_order_is_rejected(price):
+    book = OrderBook()
+    book.add_order(limit(1, 10, True, 100.0))
+    order = limit(2, 5, True, 100.0)
+    book.add_order(order)
+    book.cancel_order(2)
+
+    order.price = price
+    with pytest.raises(ValueError):
+        book.add_order(order)
+
+    # A fresh Order with the same id is fine and the old tombstone stays dead
+    book.add_order(limit(2, 5, True, price))
+    trades = book.add_order(limit(3, 15, False, 99.0))
+    assert sorted((t.buy_order_id, t.quantity) for t in trades) == [(1, 10), (2, 5)]
+    assert not book.bids and not book.bid_qty and not book.order_map
+
+
+def test_modify_quantity_down_keeps_priority():
+    book = OrderBook()
+    book.add_order(limit(1, 10, True, 100.0))
+    book.add_order(limit(2, 5, True, 100.0))
+
+    assert book.modify_order(1, new_quantity=4) == []
+    assert book.get_depth()["bids"] == [(100.0, 9)]
+
+    trades = book.add_order(limit(3, 4, False, 100.0))
+    assert [t.buy_order_id for t in trades] == [1]
+
+
+def test_modify_price_moves_level_and_can_match():
+    book = OrderBook()
+    book.add_order(limit(1, 10, True, 100.0))
+    book.add_order(limit(2, 5, True, 100.0))
+    book.add_order(limit(3, 5, False, 101.0))
+
+    assert book.modify_order(2, new_price=99.5) == []
+    assert book.get_depth()["bids"] == [(100.0, 10), (99.5, 5)]
+
+    trades = book.modify_order(1, new_price=101.0)
+    assert [(t.buy_order_id, t.sell_order_id, t.quantity) for t in trades] == [(1, 3, 5)]
+    assert book.get_best_bid() == 101.0
+    assert book.get_best_ask() is None
+    assert book.get_depth()["bids"] == [(101.0, 5), (99.5, 5)]
+
+
+def test_modify_unknown_order_raises():
+    with pytest.raises(OrderNotFound):
+        OrderBook().modify_order(42, new_quantity=1)
+
+
+def test_price_to_tick_accepts_large_cent_prices():
+    book = OrderBook()
+    for cents in (1, 9999, 12_345_678_99, 9_999_999_999):
+        assert book.price_to_tick(cents / 100) == cents
+
+
+def test_off_tick_price_is_rejected():
+    with pytest.raises(ValueError):
+        OrderBook().add_order(limit(1, 5, False, 100.004))
+
+
+def test_order_pool_is_capped():
+    from src.order import MAX_ORDER_POOL
+
+    Order.reserve(MAX_ORDER_POOL + 10)
+    assert len(Order._pool) == MAX_ORDER_POOL
+    Order(1, 1, True, 0.0, 1.0).release()
+    assert len(Order._pool) == MAX_ORDER_POOL
+    Order._pool.clear()